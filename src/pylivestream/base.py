@@ -9,8 +9,14 @@ from .utils import run, check_device
 
 __all__ = ["FileIn", "Microphone", "SaveDisk", "Screenshare", "Webcam"]
 
+# placeholder in a Livestream command template for the stream sink;
+# everything else in the argv is fixed once the Stream is configured
+_SINK = object()
+
 
 class Livestream(Stream):
+    __slots__ = ("docheck", "sink", "cmd", "cmd_template", "checkcmd")
+
     def __init__(self, inifn: Path, site: str, **kwargs) -> None:
         super().__init__(inifn, site, **kwargs)
 
@@ -29,26 +35,27 @@ class Livestream(Stream):
         audOut: typing.List[str] = self.audioOut()
 
         buf: typing.List[str] = self.buffer(self.server)
-        # %% begin to setup command line
-        cmd: typing.List[str] = []
-        cmd.append(self.exe)
-
-        cmd += self.loglevel
-        cmd += self.yes
-
-        #        cmd += self.timelimit  # terminate input after N seconds, IF specified
-
-        cmd += self.queue
-
-        cmd += vidIn + audIn
-
-        if not self.movingimage:  # FIXME: need a different filter chain to caption moving images
-            cmd += self.F.drawtext(self.caption)
 
-        cmd += vidOut + audOut
-        cmd += buf
-
-        cmd.extend(self.timelimit)  # terminate output after N seconds, IF specified
+        # FIXME: need a different filter chain to caption moving images
+        caption: typing.List[str] = self.F.drawtext(self.caption) if not self.movingimage else []
+
+        # %% setup command template in a single allocation, instead of list+copy per +=
+        # only the sink varies per launch; everything else is fixed now
+        self.cmd_template: typing.List = [
+            self.exe,
+            *self.loglevel,
+            *self.yes,
+            # *self.timelimit,  # terminate input after N seconds, IF specified
+            *self.queue,
+            *vidIn,
+            *audIn,
+            *caption,
+            *vidOut,
+            *audOut,
+            *buf,
+            *self.timelimit,  # terminate output after N seconds, IF specified
+            _SINK,
+        ]
 
         streamid: str = self.key if self.key else ""
 
@@ -59,22 +66,29 @@ class Livestream(Stream):
             sink = '"' + sink + '"'
 
         self.sink = sink
-        cmd.append(sink)
-
-        self.cmd: typing.List[str] = cmd
+        self.cmd: typing.List[str] = self.commandline(sink)
         # %% quick check command, to verify device exists
         # 0.1 seems OK, spurious buffer error on Windows that wasn't helped by any bigger size
         CHECKTIMEOUT = "0.1"
 
-        self.checkcmd: typing.List[str] = (
-            [self.exe]
-            + self.loglevel
-            + ["-t", CHECKTIMEOUT]
-            + self.videoIn(quick=True)
-            + self.audioIn(quick=True)
-            + ["-t", CHECKTIMEOUT]
-            + ["-f", "null", "-"]  # webcam needs at output
-        )
+        self.checkcmd: typing.List[str] = [
+            self.exe,
+            *self.loglevel,
+            "-t",
+            CHECKTIMEOUT,
+            *self.videoIn(quick=True),
+            *self.audioIn(quick=True),
+            "-t",
+            CHECKTIMEOUT,
+            "-f",
+            "null",
+            "-",  # webcam needs at output
+        ]
+
+    def commandline(self, sink: str) -> typing.List[str]:
+        """substitute a sink into the fixed command template"""
+
+        return [sink if x is _SINK else x for x in self.cmd_template]
 
     def startlive(self, sinks: typing.Sequence[str] = None):
         """finally start the stream(s)"""
@@ -255,6 +269,8 @@ class FileIn:
 
 
 class SaveDisk(Stream):
+    __slots__ = ("outfn", "cmd")
+
     def __init__(self, inifn: Path, outfn: Path = None, **kwargs):
         """
         records to disk screen capture with audio
@@ -273,9 +289,7 @@ class SaveDisk(Stream):
         audIn: typing.List[str] = self.audioIn()
         audOut: typing.List[str] = self.audioOut()
 
-        self.cmd: typing.List[str] = [str(self.exe)]
-        self.cmd += vidIn + audIn
-        self.cmd += vidOut + audOut
+        self.cmd: typing.List[str] = [str(self.exe), *vidIn, *audIn, *vidOut, *audOut]
 
         # ffmpeg relies on suffix for container type, this is a fallback.
         if self.outfn and not self.outfn.suffix:
@@ -302,14 +316,8 @@ def unify_streams(streams: typing.Dict[str, Stream]) -> str:
     First try: use stream with lowest video bitrate.
 
     Exploits that Python >= 3.6 has guaranteed dict() ordering.
-
-    fast native Python argmin()
-    https://stackoverflow.com/a/11825864
     """
-    vid_bw: typing.List[int] = [streams[s].video_kbps for s in streams]
-
-    argmin: int = min(range(len(vid_bw)), key=vid_bw.__getitem__)
-
-    key: str = list(streams.keys())[argmin]
+    if len(streams) == 1:
+        return next(iter(streams))
 
-    return key
+    return min(streams, key=lambda site: streams[site].video_kbps)
@@ -0,0 +1,83 @@
+"""
+Minimal ini parser for pylivestream config files.
+
+stdlib ConfigParser does a lot of per-line work (interpolation, multiline
+continuations, proxy objects) that pylivestream never uses; its files are
+plain section / key / string-value with '#' or ';' comments. Two regexes
+cover that, several times faster than ConfigParser.
+"""
+
+import re
+from typing import Dict
+
+_SECTION = re.compile(r"^\[([^\]]+)\]$")
+_KV = re.compile(r"^([^=:\s][^=:]*?)\s*[:=]\s*(.*?)$")
+_INLINE_COMMENT = re.compile(r"\s[#;].*$")
+
+_UNSET = object()
+
+
+def parse(text: str) -> Dict[str, Dict[str, str]]:
+    """
+    parse ini text into {section: {key: value}} in one pass.
+
+    Blank lines and comment lines are skipped; inline comments
+    (whitespace then '#' or ';') are stripped from values.
+    Keys before any [section] header are ignored.
+    Option names are lowercased, like ConfigParser's default optionxform.
+    """
+
+    sections: Dict[str, Dict[str, str]] = {}
+    current = None
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+
+        m = _SECTION.match(line)
+        if m:
+            current = sections.setdefault(m.group(1), {})
+            continue
+
+        m = _KV.match(line)
+        if m and current is not None:
+            current[m.group(1).lower()] = _INLINE_COMMENT.sub("", m.group(2)).rstrip()
+
+    return sections
+
+
+class FastIni:
+    """
+    drop-in for the small subset of ConfigParser that pylivestream uses:
+    "section in C", C[section], C.get() and C.getint() with fallback.
+    [DEFAULT] values fall through to every section, as with ConfigParser.
+    """
+
+    def __init__(self, text: str):
+        raw = parse(text)
+        defaults = raw.pop("DEFAULT", {})
+
+        self.defaults = defaults
+        self.sections: Dict[str, Dict[str, str]] = {
+            name: {**defaults, **sec} for name, sec in raw.items()
+        }
+
+    def __contains__(self, section: str) -> bool:
+        return section == "DEFAULT" or section in self.sections
+
+    def __getitem__(self, section: str) -> Dict[str, str]:
+        return self.sections[section]
+
+    def get(self, section: str, option: str, fallback=_UNSET) -> str:
+        try:
+            return self.sections[section][option]
+        except KeyError:
+            if fallback is _UNSET:
+                raise
+            return fallback
+
+    def getint(self, section: str, option: str, fallback=_UNSET) -> int:
+        v = self.get(section, option, fallback)
+
+        return int(v) if isinstance(v, str) else v
@@ -1,11 +1,18 @@
+import functools
+import stat
 import subprocess
-from typing import List, Union
+from typing import Dict, List, Tuple, Union
 from time import sleep
 import os
 from pathlib import Path
 import shutil
 import json
 
+# ffprobe output per (file, mtime). Forking ffprobe dominates Stream
+# construction for file sources, and a multi-site session probes the same
+# file repeatedly: for each site, once for resolution and once for framerate.
+_META_CACHE: Dict[Tuple[str, int], dict] = {}
+
 
 class Ffmpeg:
     def __init__(self):
@@ -25,7 +32,8 @@ class Ffmpeg:
         if t is None:
             return []
 
-        assert isinstance(t, (str, int, float))
+        if not isinstance(t, (str, int, float)):
+            raise TypeError(f"timelimit must be str, int or float, not {type(t).__name__}")
 
         t = str(t)
 
@@ -98,8 +106,14 @@ class Ffmpeg:
         return ["-filter_complex", f"movie={bg}:loop=0,setpts=N/FRAME_RATE/TB"]
 
 
+@functools.lru_cache(maxsize=8)
 def get_exe(exein: str) -> str:
-    """checks that host streaming program is installed"""
+    """
+    checks that host streaming program is installed
+
+    memoized: shutil.which() stats PATH entries, and the resolved executable
+    is requested again for every Stream built and every file probed
+    """
 
     exe = str(Path(exein).expanduser())
     # %% verify
@@ -123,9 +137,20 @@ def get_meta(fn: Path, exein: str = None) -> Union[None, dict]:
 
     fn = Path(fn).expanduser()
 
-    if not fn.is_file():
+    # single stat() both validates the file and keys the cache
+    try:
+        st = fn.stat()
+    except OSError:
+        raise FileNotFoundError(fn)
+
+    if not stat.S_ISREG(st.st_mode):
         raise FileNotFoundError(fn)
 
+    key = (str(fn), st.st_mtime_ns)
+    meta = _META_CACHE.get(key)
+    if meta is not None:
+        return meta
+
     exe = get_exe("ffprobe") if exein is None else exein
 
     cmd = [
@@ -141,4 +166,7 @@ def get_meta(fn: Path, exein: str = None) -> Union[None, dict]:
 
     ret = subprocess.check_output(cmd, universal_newlines=True)
     # %% decode JSON from FFprobe
-    return json.loads(ret)
+    meta = json.loads(ret)
+    _META_CACHE[key] = meta
+
+    return meta
@@ -1,13 +1,16 @@
 import bisect
+import functools
+from dataclasses import dataclass
 from pathlib import Path
 import logging
 import os
 import sys
-from configparser import ConfigParser
-from typing import List
+import weakref
+from typing import Dict, List, Tuple, Union
 
 #
 from . import utils
+from .fastini import FastIni
 from .ffmpeg import Ffmpeg, get_exe
 
 # %%  Col0: vertical pixels (height). Col1: video kbps. Interpolates.
@@ -21,15 +24,254 @@ BR60 = {720: 2250, 1080: 4500, 1440: 9000, 2160: 20000}
 # for static images, ignore YouTube bitrate warning as long as image looks OK on stream
 BRS = {240: 200, 480: 400, 720: 800, 1080: 1200, 1440: 2000, 2160: 4000}
 
+# immutable key/value pairs for video_bitrate(), precomputed so the lookup
+# doesn't rebuild two lists from the dicts on each call
+_BR30_KEYS = tuple(BR30)
+_BR30_VALS = tuple(BR30.values())
+_BR60_KEYS = tuple(BR60)
+_BR60_VALS = tuple(BR60.values())
+_BRS_KEYS = tuple(BRS)
+_BRS_VALS = tuple(BRS.values())
+
 FPS: float = 30.0  # default frames/sec if not defined otherwise
 
+# sys.platform doesn't change while running; bind it once instead of a
+# module-attribute lookup at each use
+_PLATFORM = sys.platform
+
+# the session type can't change while running either; check the environment
+# once and emit the screen-capture caveat at most once per process
+_IS_WAYLAND = os.environ.get("XDG_SESSION_TYPE") == "wayland"
+_wayland_warned = False
+
+
+def warn_wayland():
+    global _wayland_warned
+
+    if _IS_WAYLAND and not _wayland_warned:
+        logging.error("Wayland may only give black output. Try X11")
+        _wayland_warned = True
+
+
+# per-OS tail of the screengrab() input arguments, dispatched on _PLATFORM
+# instead of chained string compares on each call
+_SCREENGRAB_TAIL = {
+    "linux": lambda s, quick: ["-i", s.screenchan]
+    if quick
+    else ["-i", f"{s.screenchan}+{s.origin[0]},{s.origin[1]}"],
+    "win32": lambda s, quick: ["-i", s.screenchan]
+    if quick
+    else ["-offset_x", str(s.origin[0]), "-offset_y", str(s.origin[1]), "-i", s.screenchan],
+    "darwin": lambda s, quick: ["-i", s.screenchan],
+}
+
+# parsed config files, keyed by (filename, mtime) or by the raw text for the
+# package default. A multi-site session builds one Stream per site from the
+# same file, so parse it only once.
+_INI_CACHE: Dict[Union[str, Tuple[str, int]], FastIni] = {}
+
+
+def read_ini(inifn: Path) -> FastIni:
+    """
+    parse a pylivestream config file, memoized so that repeated Stream
+    construction (e.g. multi-site tee) doesn't re-tokenize the same file.
+    Editing the file changes its mtime, which invalidates the cached entry.
+
+    Stream.__init__ has already expanded "~", so it isn't re-expanded here.
+    """
+
+    key: Union[str, Tuple[str, int], None]
+    cfg: Union[str, None] = None
+
+    if inifn is None:
+        logging.info("using package default pylivestream.ini")
+        cfg = utils.get_inifile("pylivestream.ini")
+        key = cfg
+    else:
+        inifn = Path(inifn)
+        try:
+            key = (str(inifn), inifn.stat().st_mtime_ns)
+        except OSError:
+            key = None  # missing file: read_text() below raises to the user
+
+    C = _INI_CACHE.get(key)
+    if C is not None:
+        return C
+
+    if cfg is None:
+        cfg = inifn.read_text()
+
+    C = FastIni(cfg)
+
+    if key is not None:
+        _INI_CACHE[key] = C
+
+    return C
+
+
+@dataclass(frozen=True)
+class SiteCfg:
+    """config values for one site, frozen since the ini is fixed for a run"""
+
+    exe: str
+    probeexe: str
+    webcam_res: str
+    webcam_fps: int
+    screencap_res: str
+    screencap_fps: int
+    screencap_origin: str
+    audiofs: str
+    preset: str
+    timelimit: str
+    webcamchan: str
+    screenchan: str
+    audiochan: str
+    vcap: str
+    acap: str
+    hcam: str
+    video_kbps: int
+    audio_bps: str
+    keyframe_sec: int
+    server: str
+    key: str
+
+
+# loaded SiteCfg per config object and site. Weak keys, so an entry lives
+# exactly as long as its FastIni and a recycled object id can't serve a
+# stale SiteCfg.
+_SITE_CACHE: "weakref.WeakKeyDictionary[FastIni, Dict[str, SiteCfg]]" = weakref.WeakKeyDictionary()
+
+
+def require_option(sec: Dict[str, str], section: str, option: str) -> str:
+    """a missing mandatory option is a config error, not a KeyError"""
+
+    try:
+        return sec[option]
+    except KeyError:
+        raise ValueError(f"no option {option} in section [{section}] of configuration file") from None
+
+
+def load_site(C: FastIni, site: str) -> SiteCfg:
+    """
+    gather all config values for one site, memoized: the ini contents don't
+    change during a run, so the option lookups, int coercions and FFmpeg
+    executable search run once per site rather than per Stream.
+    """
+
+    sites = _SITE_CACHE.get(C)
+    if sites is None:
+        sites = _SITE_CACHE[C] = {}
+
+    cfg = sites.get(site)
+    if cfg is None:
+        # take the section dicts once instead of resolving the section name
+        # for every option; an unknown platform still sees the DEFAULT values
+        site_sec = C[site]
+        plat_sec = C.sections.get(_PLATFORM, C.defaults)
+
+        webcam_fps = site_sec.get("webcam_fps")
+        screencap_fps = site_sec.get("screencap_fps")
+        video_kbps = site_sec.get("video_kbps")
+
+        cfg = SiteCfg(
+            exe=get_exe(plat_sec.get("exe", "ffmpeg")),
+            probeexe=get_exe(plat_sec.get("ffprobe_exe", "ffprobe")),
+            webcam_res=site_sec.get("webcam_res"),
+            webcam_fps=int(webcam_fps) if webcam_fps is not None else None,
+            screencap_res=site_sec.get("screencap_res"),
+            screencap_fps=int(screencap_fps) if screencap_fps is not None else None,
+            screencap_origin=site_sec.get("screencap_origin"),
+            audiofs=require_option(site_sec, site, "audiofs"),
+            preset=require_option(site_sec, site, "preset"),
+            timelimit=site_sec.get("timelimit"),
+            webcamchan=plat_sec.get("webcamchan"),
+            screenchan=plat_sec.get("screenchan"),
+            audiochan=plat_sec.get("audiochan"),
+            vcap=require_option(plat_sec, _PLATFORM, "vcap"),
+            acap=plat_sec.get("acap"),
+            hcam=require_option(plat_sec, _PLATFORM, "hcam"),
+            video_kbps=int(video_kbps) if video_kbps is not None else None,
+            audio_bps=require_option(site_sec, site, "audio_bps"),
+            keyframe_sec=int(require_option(site_sec, site, "keyframe_sec")),
+            server=site_sec.get("server"),
+            key=site_sec.get("key"),
+        )
+        sites[site] = cfg
+
+    return cfg
+
+
+def cache_args(meth):
+    """
+    memoize an FFmpeg argument-builder method per Stream instance.
+
+    Everything these methods read is fixed once osparam() has run, so
+    rebuilding the identical list on every call (e.g. for each site of a
+    multi-site tee) is wasted work.
+    """
+
+    @functools.wraps(meth)
+    def wrapper(self, *args, **kwargs):
+        key = (meth.__name__, args, tuple(kwargs.items()))
+        cache = self._argcache
+        if key not in cache:
+            cache[key] = meth(self, *args, **kwargs)
+        return cache[key]
+
+    return wrapper
+
 
 # %% top level
 class Stream:
+    # fixed attribute slots: a multi-site session holds one Stream per site,
+    # and a per-instance dict of ~35 attributes is most of a Stream's memory
+    __slots__ = (
+        "F",
+        "_argcache",
+        "loglevel",
+        "inifn",
+        "site",
+        "vidsource",
+        "image",
+        "loop",
+        "infn",
+        "yes",
+        "queue",
+        "caption",
+        "timelimit",
+        "exe",
+        "probeexe",
+        "res",
+        "fps",
+        "origin",
+        "movingimage",
+        "staticimage",
+        "audiofs",
+        "preset",
+        "webcamchan",
+        "screenchan",
+        "audiochan",
+        "vcap",
+        "acap",
+        "hcam",
+        "video_kbps",
+        "audio_bps",
+        "has_audio",
+        "keyframe_sec",
+        "server",
+        "key",
+        "video_kbps_str",
+        "bitrate_arg",
+        "bufsize_arg",
+        "gop_arg",
+    )
+
     def __init__(self, inifn: Path, site: str, **kwargs):
 
         self.F = Ffmpeg()
 
+        self._argcache: Dict[tuple, List[str]] = {}
+
         self.loglevel: List[str] = self.F.INFO if kwargs.get("verbose") else self.F.ERROR
 
         self.inifn: Path = Path(inifn).expanduser() if inifn else None
@@ -56,35 +298,40 @@ class Stream:
     def osparam(self, key: str):
         """load OS specific config"""
 
-        C = ConfigParser(inline_comment_prefixes=("#", ";"))
-        if self.inifn is None:
-            logging.info("using package default pylivestream.ini")
-            cfg = utils.get_inifile("pylivestream.ini")
-        else:
-            cfg = Path(self.inifn).expanduser().read_text()
-
-        C.read_string(cfg)
-
-        self.exe = get_exe(C.get(sys.platform, "exe", fallback="ffmpeg"))
-        self.probeexe = get_exe(C.get(sys.platform, "ffprobe_exe", fallback="ffprobe"))
+        C = read_ini(self.inifn)
 
         if self.site not in C:
             raise ValueError(
                 f"streaming site {self.site} not found in configuration file {self.inifn}"
             )
 
-        if "XDG_SESSION_TYPE" in os.environ:
-            if os.environ["XDG_SESSION_TYPE"] == "wayland":
-                logging.error("Wayland may only give black output. Try X11")
+        cfg = load_site(C, self.site)
+
+        self.exe = cfg.exe
+        self.probeexe = cfg.probeexe
+
+        warn_wayland()
 
+        def need(value, option: str):
+            """an ini missing a vidsource-mandated option is a config error"""
+            if value is None:
+                raise ValueError(
+                    f"no option {option} for site {self.site} in configuration file {self.inifn}"
+                )
+            return value
+
+        # res/origin are parsed to int right here, so downstream consumers
+        # (video_bitrate, screengrab) don't each redo str/int conversions
         if self.vidsource == "camera":
-            self.res: List[str] = C.get(self.site, "webcam_res").split("x")
-            self.fps: float = C.getint(self.site, "webcam_fps")
+            self.res: List[int] = [int(v) for v in need(cfg.webcam_res, "webcam_res").split("x")]
+            self.fps: float = need(cfg.webcam_fps, "webcam_fps")
             self.movingimage = self.staticimage = False
         elif self.vidsource == "screen":
-            self.res = C.get(self.site, "screencap_res").split("x")
-            self.fps = C.getint(self.site, "screencap_fps")
-            self.origin: List[str] = C.get(self.site, "screencap_origin").split(",")
+            self.res = [int(v) for v in need(cfg.screencap_res, "screencap_res").split("x")]
+            self.fps = need(cfg.screencap_fps, "screencap_fps")
+            self.origin: List[int] = [
+                int(v) for v in need(cfg.screencap_origin, "screencap_origin").split(",")
+            ]
             self.movingimage = self.staticimage = False
         elif self.vidsource == "file":  # streaming video from a file
             self.res = utils.get_resolution(self.infn, self.probeexe)
@@ -99,35 +346,63 @@ class Stream:
         if self.res is not None and len(self.res) != 2:
             raise ValueError(f"need height, width of video resolution, I have: {self.res}")
 
-        self.audiofs: str = C.get(self.site, "audiofs")
-        self.preset: str = C.get(self.site, "preset")
+        self.audiofs: str = cfg.audiofs
+        self.preset: str = cfg.preset
 
         if not self.timelimit:
-            self.timelimit = self.F.timelimit(C.get(self.site, "timelimit", fallback=None))
+            self.timelimit = self.F.timelimit(cfg.timelimit)
 
         # NOTE: This used to be 'videochan' but that was too generic.
-        self.webcamchan: str = C.get(sys.platform, "webcamchan", fallback=None)
-        self.screenchan: str = C.get(sys.platform, "screenchan", fallback=None)
+        self.webcamchan: str = cfg.webcamchan
+        self.screenchan: str = cfg.screenchan
+
+        self.audiochan: str = cfg.audiochan
 
-        self.audiochan: str = C.get(sys.platform, "audiochan", fallback=None)
+        self.vcap: str = cfg.vcap
+        self.acap: str = cfg.acap
 
-        self.vcap: str = C.get(sys.platform, "vcap")
-        self.acap: str = C.get(sys.platform, "acap", fallback=None)
+        self.hcam: str = cfg.hcam
 
-        self.hcam: str = C.get(sys.platform, "hcam")
+        self.video_kbps: int = cfg.video_kbps
+        self.audio_bps: str = cfg.audio_bps
 
-        self.video_kbps: int = C.getint(self.site, "video_kbps", fallback=None)
-        self.audio_bps: str = C.get(self.site, "audio_bps")
+        # evaluated once; audioIn/audioOut branch on this instead of
+        # re-testing the four attributes each call
+        self.has_audio: bool = bool(self.audio_bps and self.acap and self.audiochan and self.audiofs)
 
-        self.keyframe_sec: int = C.getint(self.site, "keyframe_sec")
+        self.keyframe_sec: int = cfg.keyframe_sec
 
-        self.server: str = C.get(self.site, "server", fallback=None)
+        self.server: str = cfg.server
         # %% Key (hexaecimal stream ID)
         if key:
             self.key: str = utils.getstreamkey(key)
         else:
-            self.key = utils.getstreamkey(C.get(self.site, "key", fallback=None))
+            self.key = utils.getstreamkey(cfg.key)
+
+        self.finalize_args()
 
+    def finalize_args(self):
+        """
+        precompute FFmpeg argument strings that are fixed once the video
+        bitrate is known, rather than re-formatting them in each builder call.
+
+        Runs unconditionally at the end of osparam() so the attributes always
+        exist, and again from video_bitrate() once the bitrate is decided;
+        SaveDisk never calls video_bitrate().
+        """
+
+        fps = self.fps if self.fps is not None else FPS
+        kbps = self.video_kbps
+
+        # video_kbps stays an int for video_bitrate() logic; stringify once here
+        self.video_kbps_str: str = str(kbps)
+        self.bitrate_arg: str = self.video_kbps_str + "k"
+        # bufsize stays empty until a bitrate is known; buffer() is not used
+        # on the only bitrate-less path (SaveDisk)
+        self.bufsize_arg: str = str(kbps // 2) + "k" if kbps is not None else ""
+        self.gop_arg: str = str(self.keyframe_sec * fps)
+
+    @cache_args
     def videoIn(self, quick: bool = False) -> List[str]:
         """
         config video input
@@ -142,17 +417,18 @@ class Stream:
         else:
             raise ValueError(f"unknown vidsource {self.vidsource}")
 
-        if sys.platform == "darwin":
+        if _PLATFORM == "darwin":
             v = ["-pix_fmt", "uyvy422"] + v
 
         return v
 
+    @cache_args
     def videoOut(self) -> List[str]:
         """
         configure video output
         """
 
-        vid_format = "uyvy422" if sys.platform == "darwin" else "yuv420p"
+        vid_format = "uyvy422" if _PLATFORM == "darwin" else "yuv420p"
         v: List[str] = ["-codec:v", "libx264", "-pix_fmt", vid_format]
         # %% set frames/sec, bitrate and keyframe interval
         """
@@ -168,22 +444,23 @@ class Stream:
 
         fps = self.fps if self.fps is not None else FPS
 
-        v += ["-preset", self.preset, "-b:v", str(self.video_kbps) + "k"]
+        v += ["-preset", self.preset, "-b:v", self.bitrate_arg]
 
         if self.image:
             v += ["-r", str(fps)]
 
-        v += ["-g", str(self.keyframe_sec * fps)]
+        v += ["-g", self.gop_arg]
 
         return v
 
+    @cache_args
     def audioIn(self, quick: bool = False) -> List[str]:
         """
         -ac 2 doesn't seem to be needed, so it was removed.
 
         NOTE: -ac 2 NOT -ac 1 to avoid "non monotonous DTS in output stream" errors
         """
-        if not (self.audio_bps and self.acap and self.audiochan and self.audiofs):
+        if not self.has_audio:
             return []
 
         if self.audiochan == "null" or self.acap == "null":
@@ -203,6 +480,7 @@ class Stream:
 
         return a
 
+    @cache_args
     def audioOut(self) -> List[str]:
         """
         select audio codec
@@ -212,10 +490,11 @@ class Stream:
         https://www.facebook.com/facebookmedia/get-started/live
         """
 
-        if not (self.audio_bps and self.acap and self.audiochan and self.audiofs):
+        if not self.has_audio:
             return []
 
-        return ["-codec:a", "aac", "-b:a", str(self.audio_bps), "-ar", str(self.audiofs)]
+        # audio_bps and audiofs are kept as the ini strings; no str() round-trip
+        return ["-codec:a", "aac", "-b:a", self.audio_bps, "-ar", self.audiofs]
 
     def video_bitrate(self):
         """
@@ -226,7 +505,7 @@ class Stream:
             return
 
         if self.res is not None:
-            x: int = int(self.res[1])
+            x: int = self.res[1]
         elif self.vidsource is None or self.vidsource == "file":
             logging.info("assuming 480p input.")
             x = 480
@@ -237,11 +516,23 @@ class Stream:
             )
 
         if self.fps is None or self.fps < 20:
-            self.video_kbps: int = list(BRS.values())[bisect.bisect_left(list(BRS.keys()), x)]
+            table, keys, vals = BRS, _BRS_KEYS, _BRS_VALS
         elif 20 <= self.fps <= 35:
-            self.video_kbps: int = list(BR30.values())[bisect.bisect_left(list(BR30.keys()), x)]
+            table, keys, vals = BR30, _BR30_KEYS, _BR30_VALS
         else:
-            self.video_kbps: int = list(BR60.values())[bisect.bisect_left(list(BR60.keys()), x)]
+            table, keys, vals = BR60, _BR60_KEYS, _BR60_VALS
+
+        # standard heights (240/480/720/...) hit the table directly;
+        # bisect only for odd sizes, rounding up to the next table entry
+        kbps = table.get(x)
+        if kbps is None:
+            i = bisect.bisect_left(keys, x)
+            # clamp to the top table entry for resolutions beyond the largest key
+            kbps = vals[min(i, len(vals) - 1)]
+
+        self.video_kbps: int = kbps
+
+        self.finalize_args()
 
     def screengrab(self, quick: bool = False) -> List[str]:
         """
@@ -256,21 +547,11 @@ class Stream:
         #     v += ['-r', str(self.fps)]
 
         if not quick and self.res is not None:
-            v += ["-s", "x".join(map(str, self.res))]
-
-        if sys.platform == "linux":
-            if quick:
-                v += ["-i", self.screenchan]
-            else:
-                v += ["-i", f"{self.screenchan}+{self.origin[0]},{self.origin[1]}"]
-        elif sys.platform == "win32":
-            if not quick:
-                v += ["-offset_x", str(self.origin[0]), "-offset_y", str(self.origin[1])]
-
-            v += ["-i", self.screenchan]
+            v += ["-s", f"{self.res[0]}x{self.res[1]}"]
 
-        elif sys.platform == "darwin":
-            v += ["-i", self.screenchan]
+        tail = _SCREENGRAB_TAIL.get(_PLATFORM)
+        if tail is not None:
+            v += tail(self, quick)
 
         return v
 
@@ -282,7 +563,7 @@ class Stream:
         """
         webcam_chan = self.webcamchan
 
-        if sys.platform == "darwin":
+        if _PLATFORM == "darwin":
             if not webcam_chan:
                 webcam_chan = "default"
 
@@ -331,12 +612,13 @@ class Stream:
 
         return v
 
+    @cache_args
     def buffer(self, server: str) -> List[str]:
         """configure network buffer. Tradeoff: latency vs. robustness"""
         # constrain to single thread, default is multi-thread
         # buf = ['-threads', '1']
 
-        buf = ["-maxrate", f"{self.video_kbps}k", "-bufsize", f"{self.video_kbps//2}k"]
+        buf = ["-maxrate", self.bitrate_arg, "-bufsize", self.bufsize_arg]
 
         if self.staticimage:  # static image + audio
             buf += ["-shortest"]
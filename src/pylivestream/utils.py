@@ -1,3 +1,4 @@
+import errno
 import logging
 import subprocess
 from pathlib import Path
@@ -101,7 +102,7 @@ def meta_caption(meta) -> str:
     return caption
 
 
-def get_resolution(fn: Path, exe: str = None) -> T.List[str]:
+def get_resolution(fn: Path, exe: str = None) -> T.List[int]:
     """
     get resolution (widthxheight) of video file
     http://trac.ffmpeg.org/wiki/FFprobeTips#WidthxHeight
@@ -114,7 +115,7 @@ def get_resolution(fn: Path, exe: str = None) -> T.List[str]:
 
     outputs:
     -------
-    res:  (width,height) in pixels of the video
+    res:  [width, height] in integer pixels of the video
 
     if not a video file, None is returned.
     """
@@ -187,15 +188,23 @@ def getstreamkey(keyfn: str) -> str:
         return None
 
     keyp = Path(keyfn).expanduser().resolve(strict=False)
-    if keyp.is_file():
+    # just try to open: one syscall instead of stat + open when it is a file
+    try:
         # read only first line in case of trailing blank line
-        key = keyp.read_text().split("\n")[0].strip()
-    elif keyp.suffix == ".key":
-        raise FileNotFoundError(keyp)
-    elif keyp.is_dir():
-        raise IsADirectoryError(keyp)
-    else:
-        # assume it's a text key
-        key = keyfn
-
-    return key
+        return keyp.read_text().split("\n")[0].strip()
+    except IsADirectoryError:
+        raise
+    except FileNotFoundError:
+        if keyp.suffix == ".key":
+            raise
+    except OSError as e:
+        # Windows raises PermissionError for a directory, not IsADirectoryError
+        if keyp.is_dir():
+            raise IsADirectoryError(keyp)
+        # only "this string isn't a usable path" means a literal key;
+        # real I/O errors (e.g. unreadable key file) must propagate
+        if e.errno not in (errno.ENOENT, errno.ENAMETOOLONG, errno.EINVAL, errno.ENOTDIR):
+            raise
+
+    # assume it's a text key
+    return keyfn
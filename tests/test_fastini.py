@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+from configparser import ConfigParser
+from pathlib import Path
+
+import pylivestream as pls
+from pylivestream.fastini import FastIni, parse
+import pytest
+
+R = Path(__file__).parent
+
+
+def configparser_read(text: str) -> ConfigParser:
+    C = ConfigParser(inline_comment_prefixes=("#", ";"))
+    C.read_string(text)
+    return C
+
+
+@pytest.mark.parametrize("fn", [None, R / "no_audio.ini"], ids=["packaged", "no_audio"])
+def test_matches_configparser(fn):
+    """FastIni must agree with ConfigParser on real pylivestream configs"""
+    text = (fn.read_text() if fn else pls.utils.get_inifile("pylivestream.ini"))
+
+    C = configparser_read(text)
+    F = FastIni(text)
+
+    for section in C.sections():
+        assert section in F
+        for option in C[section]:
+            assert F.get(section, option) == C.get(section, option), (section, option)
+
+
+def test_inline_comment():
+    data = parse("[s]\nkey: value  # trailing\nurl: rtmp://host  ; other\n")
+    assert data["s"] == {"key": "value", "url": "rtmp://host"}
+
+
+def test_empty_value():
+    F = FastIni("[s]\ntimelimit:\n")
+    assert F.get("s", "timelimit") == ""
+
+
+def test_default_fallthrough():
+    F = FastIni("[DEFAULT]\npreset: veryfast\n[s]\nserver: rtmp://x\n")
+    assert F.get("s", "preset") == "veryfast"
+    assert F.get("s", "server") == "rtmp://x"
+    assert "DEFAULT" in F
+
+
+def test_option_case_insensitive():
+    """ConfigParser lowercases option names; user inis rely on that"""
+    F = FastIni("[s]\nServer: rtmp://x\nKEY: abc\n")
+    assert F.get("s", "server") == "rtmp://x"
+    assert F.get("s", "key") == "abc"
+
+
+def test_fallback():
+    F = FastIni("[s]\nvideo_kbps: 2500\n")
+    assert F.getint("s", "video_kbps") == 2500
+    assert F.getint("s", "nothere", fallback=None) is None
+    assert F.get("s", "nothere", fallback="dflt") == "dflt"
+
+    with pytest.raises(KeyError):
+        F.get("s", "nothere")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])